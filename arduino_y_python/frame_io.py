@@ -0,0 +1,164 @@
+"""
+Framing serial Python <-> Arduino: [cmd:1][len:2 little][payload][crc:2 little].
+Módulo único con CRC/tablas y lectura/escritura de frames; los scripts lo importan.
+"""
+import serial # Lectura y escritura en serial -> Bridge entre Python (lógica) y Arduino (físico)
+import time
+import struct
+from array import array
+from binascii import crc_hqx  # CRC-CCITT (poly 0x1021, sin reflejar) en C
+
+# Header del frame: [cmd:1][len:2 little]
+_HEADER = struct.Struct("<BH")
+# CRC al final del frame: [crc:2 little]
+_CRC = struct.Struct("<H")
+
+__all__ = [
+    "crc16_ccitt", "crc16_ccitt_update", "verificar_crc",
+    "armar_frame", "read_exact", "recibir_senal", "enviar_senal", "enviar_senal_raw",
+    "fetch", "CMD_READ_DESC", "CMD_PING",
+]
+
+# ---------- CRC16-CCITT (FALSE) ----------
+_CRC16_POLY = 0x1021
+
+def _crc16_bitwise(data: bytes, poly: int, init: int) -> int:
+    crc = init
+    for b in data:
+        crc ^= (b << 8)
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) & 0xFFFF) ^ poly
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc & 0xFFFF
+
+# Tabla precalculada al importar: CRC de cada byte posible (1 lookup por byte en vez de 8 iteraciones)
+_CRC16_TABLE = array("H", (_crc16_bitwise(bytes([i]), _CRC16_POLY, 0) for i in range(256)))
+
+def crc16_ccitt(data: bytes, poly: int = _CRC16_POLY, init: int = 0xFFFF) -> int:
+    if poly != _CRC16_POLY:
+        # La tabla solo vale para 0x1021
+        return _crc16_bitwise(data, poly, init)
+    table = _CRC16_TABLE
+    crc = init & 0xFFFF
+    for b in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[((crc >> 8) ^ b) & 0xFF]
+    return crc
+
+def crc16_ccitt_update(crc: int, data) -> int:
+    """
+    Continúa un CRC en curso con más datos (bytes/bytearray/memoryview, sin copiar).
+    crc16_ccitt_update(crc16_ccitt_update(0xFFFF, a), b) == crc16_ccitt(a + b)
+    Usa binascii.crc_hqx (mismo CRC, implementado en C).
+    """
+    return crc_hqx(data, crc)
+
+def verificar_crc(cmd: int, length: int, payload: bytes, crc_rx: int) -> bool:
+    header = _HEADER.pack(cmd, length)
+    calc = crc16_ccitt_update(crc16_ccitt_update(0xFFFF, header), payload)
+    return calc == crc_rx
+
+# ---------- Armar frame (cmd + len + payload + crc) ----------
+def armar_frame(cmd: int, payload: bytes = b"") -> bytes:
+    """
+    Frame: [cmd:1][len:2 little][payload][crc:2 little]
+    CRC sobre (cmd + len + payload)
+    """
+    length = len(payload)
+    header = _HEADER.pack(cmd, length)
+    crc = crc16_ccitt_update(crc16_ccitt_update(0xFFFF, header), payload)
+    return b"".join((header, payload, _CRC.pack(crc)))
+
+# ---------- Lectura exacta ----------
+def read_exact(ser: serial.Serial, n: int) -> bytes:
+    """
+    Lee exactamente n bytes del serial (o lanza TimeoutError).
+    Usa el timeout configurado en ser.timeout.
+    """
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = ser.read(n - len(buf))
+        if not chunk:
+            raise TimeoutError(f"No llegaron {n} bytes a tiempo (llegaron {len(buf)}).")
+        buf.extend(chunk)
+    return bytes(buf)
+
+# ---------- Recibir frame ----------
+def recibir_senal(ser: serial.Serial):
+    """
+    Lee un frame:
+      [cmd:1][len:2 little][payload:len][crc:2 little]
+    Retorna (cmd:int, payload:bytes) si CRC OK.
+    """
+    cmd, length = _HEADER.unpack(read_exact(ser, _HEADER.size))
+
+    # payload + crc en una sola lectura (2 lecturas por frame en vez de 3)
+    body = read_exact(ser, length + 2)
+    payload = body[:length]
+    crc_rx = int.from_bytes(body[length:], "little")
+
+    if not verificar_crc(cmd, length, payload, crc_rx):
+        raise ValueError(
+            f"CRC inválido. cmd=0x{cmd:02X} len={length} crc_rx=0x{crc_rx:04X}"
+        )
+
+    return cmd, payload
+
+# ---------- Enviar frame ----------
+def enviar_senal(ser: serial.Serial, cmd: int, payload: bytes = b""):
+    frame = armar_frame(cmd, payload)
+    ser.write(frame)
+
+def enviar_senal_raw(ser: serial.Serial, frame: bytes):
+    # frame ya armado (ej. precalculado): un solo write
+    ser.write(frame)
+
+# ---------- Comandos mínimos (deben coincidir con Arduino) ----------
+CMD_READ_DESC = 0x01
+CMD_PING      = 0x02
+
+# Frames sin payload de comandos fijos: son invariantes, se arman una sola vez al importar
+_FRAME_READ_DESC = armar_frame(CMD_READ_DESC)
+_FRAME_PING      = armar_frame(CMD_PING)
+_FRAMES_FIJOS = {CMD_READ_DESC: _FRAME_READ_DESC, CMD_PING: _FRAME_PING}
+
+# ---------- Fetch: manda cmd y espera respuesta ----------
+def fetch(ser: serial.Serial, cmd: int, payload: bytes = b"", retries: int = 3):
+    """
+    1) Envía un cmd (frame)
+    2) Espera UNA respuesta válida
+    3) Reintenta si hay timeout o CRC inválido
+    """
+    # el frame no cambia entre reintentos: se arma (o se toma precalculado) una vez
+    frame = None if payload else _FRAMES_FIJOS.get(cmd)
+    if frame is None:
+        frame = armar_frame(cmd, payload)
+
+    last_err = None
+    delay = 0.005  # backoff exponencial: 5 ms -> 10 ms -> 20 ms ... (máx 100 ms)
+    for attempt in range(1, retries + 1):
+        try:
+            # Limpia basura antes del intento (útil si quedaste desfasado, o si un
+            # timeout cortó un frame a la mitad y su cola llegó después)
+            ser.reset_input_buffer()
+
+            enviar_senal_raw(ser, frame)
+            rcmd, rpayload = recibir_senal(ser)
+
+            # Opcional: exigir que el cmd de respuesta coincida
+            if rcmd != cmd and rcmd != 0xFF:
+                raise ValueError(f"Respuesta cmd inesperado: 0x{rcmd:02X} (esperaba 0x{cmd:02X})")
+
+            return rcmd, rpayload
+
+        except (TimeoutError, ValueError) as e:
+            last_err = e
+            if attempt == retries:
+                break
+            # micro-pausa antes de reintentar: deja llegar la cola de un frame a medias
+            # antes de limpiar el buffer
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    raise RuntimeError(f"Fetch falló tras {retries} intentos. Último error: {last_err}")
@@ -1,13 +1,23 @@
-from typing import Callable, Dict, List, Any
+from collections import defaultdict
+from typing import Callable, DefaultDict, Iterable, Tuple
+
+Handler = Callable[[dict], None]
 
 class EventBus:
     def __init__(self):
-        self._subs: Dict[str, List[Callable[[dict], None]]] = {}
+        # tuple per topic, rebuilt on subscribe (publish is far more frequent)
+        self._subs: DefaultDict[str, Tuple[Handler, ...]] = defaultdict(tuple)
 
-    def subscribe(self, topic: str, handler: Callable[[dict], None]) -> None:
-        self._subs.setdefault(topic, []).append(handler)
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        self._subs[topic] = self._subs[topic] + (handler,)
 
     def publish(self, topic: str, event: dict) -> None:
         # fan-out
-        for handler in self._subs.get(topic, []):
+        for handler in self._subs[topic]:
             handler(event)
+
+    def publish_many(self, topic: str, events: Iterable[dict]) -> None:
+        handlers = self._subs[topic]
+        for event in events:
+            for handler in handlers:
+                handler(event)
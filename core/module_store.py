@@ -1,10 +1,64 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Any, List
 import json
+import math
+import os
 import time
 
+try:
+    import orjson  # optional: emits UTF-8 bytes directly, much faster than stdlib json
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+# Below this many files a plain loop wins (pool startup costs more than the reads);
+# the pool only pays off for large directories or slow/cold storage.
+_PARALLEL_LOAD_MIN_FILES = 64
+
+
+def _loads(raw: bytes) -> Any:
+    # stdlib on purpose: orjson turns integers beyond 64 bits into floats and rejects NaN
+    return json.loads(raw)  # accepts UTF-8 bytes, no separate str decode
+
+
+def _has_nonfinite(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_nonfinite(v) for v in obj.values())
+    if isinstance(obj, list):
+        return any(_has_nonfinite(v) for v in obj)
+    return False
+
+
+def _orjson_dumps(obj: Any, pretty: bool) -> bytes | None:
+    """orjson output, or None when it would fail or differ from stdlib json."""
+    if orjson is None or _has_nonfinite(obj):  # orjson writes NaN/Infinity as null
+        return None
+    option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS if pretty else 0
+    try:
+        return orjson.dumps(obj, option=option)
+    except TypeError:  # orjson.JSONEncodeError, e.g. integers beyond 64 bits
+        return None
+
+
+def _dumps(obj: Any) -> bytes:
+    out = _orjson_dumps(obj, pretty=False)
+    if out is not None:
+        return out
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _dumps_pretty(obj: Any) -> bytes:
+    out = _orjson_dumps(obj, pretty=True)
+    if out is not None:
+        return out
+    return json.dumps(obj, indent=2, sort_keys=True).encode("utf-8")
+
+
 @dataclass
 class ModuleStore:
     modules_dir: Path
@@ -15,20 +69,40 @@ class ModuleStore:
     def list_files(self) -> List[Path]:
         return sorted(self.modules_dir.glob("*.json"))
 
+    def load_file(self, p: Path) -> Dict[str, Any]:
+        return _loads(p.read_bytes())
+
+    def _load_one(self, p: Path) -> Dict[str, Any] | None:
+        try:
+            return self.load_file(p)
+        except Exception as e:
+            # Bad JSON shouldn't crash the whole app
+            print(f"[WARN] Could not load {p.name}: {e}")
+            return None
+
     def load_all(self) -> List[Dict[str, Any]]:
-        out: List[Dict[str, Any]] = []
-        for p in self.list_files():
-            try:
-                out.append(json.loads(p.read_text(encoding="utf-8")))
-            except Exception as e:
-                # Bad JSON shouldn't crash the whole app
-                print(f"[WARN] Could not load {p.name}: {e}")
-        return out
+        files = self.list_files()
+        if len(files) < _PARALLEL_LOAD_MIN_FILES:
+            results = [self._load_one(p) for p in files]
+        else:
+            # files are independent: overlap reads, ex.map keeps the sorted order
+            with ThreadPoolExecutor(max_workers=min(32, len(files))) as ex:
+                results = list(ex.map(self._load_one, files))
+        return [desc for desc in results if desc is not None]
 
-    def save_descriptor(self, desc: Dict[str, Any], filename: str | None = None) -> Path:
+    def save_descriptor(
+        self,
+        desc: Dict[str, Any],
+        filename: str | None = None,
+        *,
+        pretty: bool = False,
+        durable: bool = False,
+    ) -> Path:
         """
         Save descriptor as a JSON file. If filename is None, make one using module_id + timestamp.
         Uses atomic write to avoid partially-written files.
+        Compact JSON by default; pretty=True indents and sorts keys for hand editing.
+        durable=True fsyncs the data before the rename (survives power loss, but slower).
         """
         module_id = desc.get("module_id", "UNKNOWN")
         safe_id = "".join(c for c in module_id if c.isalnum() or c in ("-", "_"))
@@ -40,7 +114,12 @@ class ModuleStore:
         path = self.modules_dir / name
         tmp = self.modules_dir / (name + ".tmp")
 
-        tmp.write_text(json.dumps(desc, indent=2, sort_keys=True), encoding="utf-8")
+        payload = _dumps_pretty(desc) if pretty else _dumps(desc)
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
         tmp.replace(path)  # atomic on most OSes
 
         return path
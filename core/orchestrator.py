@@ -47,8 +47,4 @@ class Orchestrator:
             self.bus.publish("MODE_CHANGED", {"mode": self.mode, "why": reason})
 
     def _has_capability(self, cap_type: str) -> bool:
-        for m in self.state.modules.values():
-            for cap in m.get("capabilities", []):
-                if cap.get("type") == cap_type:
-                    return True
-        return False
+        return self.state.capability_types.get(cap_type, 0) > 0
@@ -1,8 +1,40 @@
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
+import jsonschema
 
 REQUIRED_TOP_KEYS = {"module_id", "name", "vendor", "version", "certified", "interfaces", "capabilities", "constraints"}
 
+# Descriptor shape, compiled once into a validator and reused for every join
+DESCRIPTOR_SCHEMA = {
+    "type": "object",
+    "required": sorted(REQUIRED_TOP_KEYS),
+    "properties": {
+        "module_id": {"type": "string"},
+        "interfaces": {
+            "type": "object",
+            "required": ["power", "data"],
+            "properties": {
+                "power": {
+                    "type": "object",
+                    "properties": {"max_w": {"type": "integer"}},
+                },
+                "data": {"type": "object"},
+            },
+        },
+        "capabilities": {"type": "array", "items": {"type": "object"}},
+        "constraints": {
+            "type": "object",
+            "properties": {
+                "thermal_w": {"type": "integer"},
+                "requires": {"type": "array", "items": {"type": "string"}},
+                "conflicts": {"type": "array", "items": {"type": "string"}},
+            },
+        },
+    },
+}
+_VALIDATOR = jsonschema.Draft202012Validator(DESCRIPTOR_SCHEMA)
+
 @dataclass
 class SatelliteLimits:
     power_bus_v: int = 28
@@ -10,12 +42,29 @@ class SatelliteLimits:
     thermal_budget_w: int = 30
     data_protocol: str = "SpaceWire"
 
+@dataclass(slots=True, frozen=True)
+class Cap:
+    type: Optional[str]
+    tag: Optional[str]
+
+@dataclass(slots=True)
+class Module:
+    """Compact record of a joined module; raw keeps the original descriptor."""
+    module_id: str
+    max_w: int
+    thermal_w: int
+    certified: bool
+    capabilities: Tuple[Cap, ...]
+    raw: Dict[str, Any]
+
 @dataclass
 class SatelliteState:
     limits: SatelliteLimits = field(default_factory=SatelliteLimits)
     # active/known modules
-    modules: Dict[str, Dict[str, Any]] = field(default_factory=dict)
-    tags_present: set = field(default_factory=set)  # e.g., {"COMPUTE"}
+    modules: Dict[str, Module] = field(default_factory=dict)
+    tags_present: frozenset = frozenset()  # e.g., {"COMPUTE"}; snapshot replaced on join/remove
+    capability_types: Counter = field(default_factory=Counter)  # cap type -> joined capabilities of that type
+    tag_refs: Counter = field(default_factory=Counter)  # tag -> how many joined caps provide it
 
     used_power_w: int = 0
     used_thermal_w: int = 0
@@ -26,34 +75,39 @@ class ModuleRegistry:
         self.quarantine: Dict[str, Dict[str, Any]] = {}
 
     def _basic_schema_check(self, desc: Dict[str, Any]) -> Tuple[bool, str]:
-        missing = REQUIRED_TOP_KEYS - set(desc.keys())
-        if missing:
-            return False, f"Missing keys: {sorted(missing)}"
-        if "power" not in desc["interfaces"] or "data" not in desc["interfaces"]:
-            return False, "interfaces must include power and data"
+        errors = sorted(_VALIDATOR.iter_errors(desc), key=lambda e: e.json_path)
+        if errors:
+            return False, "; ".join(f"{e.json_path}: {e.message}" for e in errors)
         return True, "OK"
 
-    def _compatibility_check(self, desc: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    def _compatibility_check(self, desc: Dict[str, Any]) -> Tuple[bool, List[str], int, int]:
+        """
+        Returns (compatible, reasons, max_w, thermal_w) so the caller can reuse the draw.
+        Assumes _basic_schema_check passed; "integer" there also accepts 15.0, hence the int() below.
+        """
         reasons = []
         lim = self.state.limits
+        power = desc["interfaces"]["power"]
+        data = desc["interfaces"]["data"]
+        constraints = desc["constraints"]
 
         # trust/certification gate (simple but hackathon-friendly)
         if not desc.get("certified", False):
             reasons.append("Module not certified (zero-trust policy).")
 
         # power bus compatibility
-        bus_v = desc["interfaces"]["power"].get("bus_v")
+        bus_v = power.get("bus_v")
         if bus_v != lim.power_bus_v:
             reasons.append(f"Power bus mismatch: sat {lim.power_bus_v}V vs module {bus_v}V")
 
         # data protocol compatibility
-        protocol = desc["interfaces"]["data"].get("protocol")
+        protocol = data.get("protocol")
         if protocol != lim.data_protocol:
             reasons.append(f"Data protocol mismatch: sat {lim.data_protocol} vs module {protocol}")
 
         # resource budgets
-        max_w = int(desc["interfaces"]["power"].get("max_w", 0))
-        thermal_w = int(desc["constraints"].get("thermal_w", 0))
+        max_w = int(power.get("max_w", 0))
+        thermal_w = int(constraints.get("thermal_w", 0))
 
         if self.state.used_power_w + max_w > lim.power_budget_w:
             reasons.append(f"Power budget exceeded: used {self.state.used_power_w}W + {max_w}W > {lim.power_budget_w}W")
@@ -61,19 +115,19 @@ class ModuleRegistry:
         if self.state.used_thermal_w + thermal_w > lim.thermal_budget_w:
             reasons.append(f"Thermal budget exceeded: used {self.state.used_thermal_w}W + {thermal_w}W > {lim.thermal_budget_w}W")
 
+        tags = self.state.tags_present
+
         # dependency tags
-        requires = set(desc["constraints"].get("requires", []))
-        if not requires.issubset(self.state.tags_present):
-            missing = sorted(list(requires - self.state.tags_present))
-            if missing:
-                reasons.append(f"Missing required capabilities/tags: {missing}")
+        missing = frozenset(constraints.get("requires", ())).difference(tags)
+        if missing:
+            reasons.append(f"Missing required capabilities/tags: {sorted(missing)}")
 
         # conflicts
-        conflicts = set(desc["constraints"].get("conflicts", []))
-        if conflicts & self.state.tags_present:
-            reasons.append(f"Conflicts with present tags: {sorted(list(conflicts & self.state.tags_present))}")
+        clash = tags.intersection(constraints.get("conflicts", ()))
+        if clash:
+            reasons.append(f"Conflicts with present tags: {sorted(clash)}")
 
-        return (len(reasons) == 0), reasons
+        return (len(reasons) == 0), reasons, max_w, thermal_w
 
     def discover_and_join(self, desc: Dict[str, Any]) -> Tuple[bool, str, List[str]]:
         ok, msg = self._basic_schema_check(desc)
@@ -83,56 +137,73 @@ class ModuleRegistry:
             self.quarantine[mid] = desc
             return False, "QUARANTINED_SCHEMA", [msg]
 
-        compatible, reasons = self._compatibility_check(desc)
         mid = desc["module_id"]
+        # budgets/tags/capabilities are counted per join: a module_id can only be joined once
+        if mid in self.state.modules:
+            return False, "ALREADY_JOINED", [f"Module {mid} is already joined (disconnect it first)."]
+
+        compatible, reasons, max_w, thermal_w = self._compatibility_check(desc)
 
         if not compatible:
             self.quarantine[mid] = desc
             return False, "QUARANTINED_COMPAT", reasons
 
         # join: register + consume budgets + add tags
-        self.state.modules[mid] = desc
-        max_w = int(desc["interfaces"]["power"].get("max_w", 0))
-        thermal_w = int(desc["constraints"].get("thermal_w", 0))
+        module = Module(
+            module_id=mid,
+            max_w=max_w,
+            thermal_w=thermal_w,
+            certified=bool(desc.get("certified", False)),
+            capabilities=tuple(Cap(cap.get("type"), cap.get("tag")) for cap in desc.get("capabilities", [])),
+            raw=desc,
+        )
+        self.state.modules[mid] = module
         self.state.used_power_w += max_w
         self.state.used_thermal_w += thermal_w
 
         # tags: from compute capability or explicit tag field
-        for cap in desc.get("capabilities", []):
-            if cap.get("type") == "compute":
-                self.state.tags_present.add("COMPUTE")
-            if "tag" in cap:
-                self.state.tags_present.add(cap["tag"])
+        for cap in module.capabilities:
+            if cap.type is not None:
+                self._incr(self.state.capability_types, cap.type)
+            if cap.type == "compute":
+                self._incr(self.state.tag_refs, "COMPUTE")
+            if cap.tag is not None:
+                self._incr(self.state.tag_refs, cap.tag)
+        self.state.tags_present = frozenset(self.state.tag_refs)
 
         return True, "JOINED", []
+
+    # refcount helpers shared by capability_types and tag_refs (join/remove stay symmetric)
+    @staticmethod
+    def _incr(refs: Counter, key: str) -> None:
+        refs[key] += 1
+
+    @staticmethod
+    def _decr(refs: Counter, key: str) -> None:
+        refs[key] -= 1
+        if refs[key] <= 0:
+            del refs[key]
     
     def remove_module(self, module_id: str) -> bool:
         """
-        Remove a joined module from satellite state and recompute budgets/tags.
+        Remove a joined module from satellite state and release its budgets/tags.
         Returns True if removed, False if not present.
         """
         if module_id not in self.state.modules:
             return False
 
-        # Remove it
-        self.state.modules.pop(module_id)
+        # Remove it and subtract only its own contribution
+        module = self.state.modules.pop(module_id)
+        self.state.used_power_w -= module.max_w
+        self.state.used_thermal_w -= module.thermal_w
 
-        # Recompute budgets + tags from scratch (simple & safe for hackathon)
-        self.state.used_power_w = 0
-        self.state.used_thermal_w = 0
-        self.state.tags_present = set()
-
-        for desc in self.state.modules.values():
-            max_w = int(desc["interfaces"]["power"].get("max_w", 0))
-            thermal_w = int(desc["constraints"].get("thermal_w", 0))
-            self.state.used_power_w += max_w
-            self.state.used_thermal_w += thermal_w
-
-            for cap in desc.get("capabilities", []):
-                if cap.get("type") == "compute":
-                    self.state.tags_present.add("COMPUTE")
-                if "tag" in cap:
-                    self.state.tags_present.add(cap["tag"])
+        for cap in module.capabilities:
+            if cap.type is not None:
+                self._decr(self.state.capability_types, cap.type)
+            if cap.type == "compute":
+                self._decr(self.state.tag_refs, "COMPUTE")
+            if cap.tag is not None:
+                self._decr(self.state.tag_refs, cap.tag)
+        self.state.tags_present = frozenset(self.state.tag_refs)
 
         return True
-
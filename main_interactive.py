@@ -1,12 +1,28 @@
 from __future__ import annotations
 import json
+import sys
 from pathlib import Path
+from typing import Callable, Dict, List, Tuple
 
 from core.event_bus import EventBus
 from core.registry import SatelliteState, ModuleRegistry
 from core.orchestrator import Orchestrator
 from core.module_store import ModuleStore
 
+HELP_TEXT = (
+    "\nCommands:\n"
+    "  state                         Show current satellite state\n"
+    "  kp <value>                    Publish SPACE_WEATHER (kp index)\n"
+    "  pass <minutes>                Publish NEXT_PASS (minutes to next pass)\n"
+    "  anomaly <signature>           Publish ANOMALY event\n"
+    "  connect_file <path.json>      Load a descriptor from file and try to join\n"
+    "  connect_json                  Paste JSON descriptor (ends with a blank line)\n"
+    "  disconnect <module_id>        Remove a joined module\n"
+    "  list_modules                  List descriptor files in ./modules\n"
+    "  save_json                     Paste JSON descriptor and save to ./modules then join\n"
+    "  quit / exit                   Stop the app\n"
+)
+
 
 def pretty_state(state: SatelliteState) -> str:
     lines = []
@@ -59,10 +75,109 @@ def main() -> None:
 
     print("\nType 'help' to see commands.\n")
 
+    # ---- Line source: prompt when interactive, batched replay when stdin is piped ----
+    read_line: Callable[..., str]
+    if sys.stdin.isatty():
+        read_line = input
+    else:
+        replay = iter(sys.stdin.read().splitlines())
+
+        def _replay_line(prompt: str = "") -> str:
+            try:
+                return next(replay)
+            except StopIteration:
+                raise EOFError from None
+
+        read_line = _replay_line
+
+    # ---- Command handlers (parts = whole command line split) ----
+    def do_help(parts: List[str]) -> None:
+        print(HELP_TEXT)
+
+    def do_state(parts: List[str]) -> None:
+        print(pretty_state(state))
+        print("Quarantine IDs:", ", ".join(sorted(reg.quarantine.keys())) if reg.quarantine else "(none)")
+
+    def do_kp(parts: List[str]) -> None:
+        bus.publish("SPACE_WEATHER", {"kp": float(parts[1])})
+
+    def do_pass(parts: List[str]) -> None:
+        bus.publish("NEXT_PASS", {"minutes": int(parts[1])})
+
+    def do_anomaly(parts: List[str]) -> None:
+        signature = " ".join(parts[1:])
+        bus.publish("ANOMALY", {"signature": signature})
+
+    def do_list_modules(parts: List[str]) -> None:
+        files = store.list_files()
+        if not files:
+            print("(no module JSON files found)")
+        else:
+            for p in files:
+                print("-", p.name)
+
+    def do_connect_file(parts: List[str]) -> None:
+        p = Path(parts[1]).expanduser()
+        if not p.exists():
+            print("File not found.")
+            return
+        try:
+            desc = store.load_file(p)
+        except Exception as e:
+            print("Invalid JSON:", e)
+            return
+        connect_module(bus, reg, desc)
+
+    def do_disconnect(parts: List[str]) -> None:
+        module_id = parts[1]
+        if reg.remove_module(module_id):
+            bus.publish("MODULE_REMOVED", {"module_id": module_id})
+            # recomposition after removal (force re-evaluate)
+            orch._recompose(reason=f"module removed: {module_id}")
+        else:
+            print("Module not joined:", module_id)
+
+    def do_paste_json(parts: List[str]) -> None:
+        print("Paste JSON (end with an empty line):")
+        lines = []
+        while True:
+            try:
+                line = read_line()
+            except EOFError:
+                break
+            if line.strip() == "":
+                break
+            lines.append(line)
+        raw = "\n".join(lines)
+        try:
+            desc = json.loads(raw)
+        except Exception as e:
+            print("Invalid JSON:", e)
+            return
+
+        if parts[0].lower() == "save_json":
+            path = store.save_descriptor(desc, pretty=True)
+            print(f"Saved to {path}")
+        connect_module(bus, reg, desc)
+
+    # op -> (handler, minimum number of parts including the op itself)
+    commands: Dict[str, Tuple[Callable[[List[str]], None], int]] = {
+        "help": (do_help, 1),
+        "state": (do_state, 1),
+        "kp": (do_kp, 2),
+        "pass": (do_pass, 2),
+        "anomaly": (do_anomaly, 2),
+        "list_modules": (do_list_modules, 1),
+        "connect_file": (do_connect_file, 2),
+        "disconnect": (do_disconnect, 2),
+        "connect_json": (do_paste_json, 1),
+        "save_json": (do_paste_json, 1),
+    }
+
     # ---- Interactive loop (REPL) ----
     while True:
         try:
-            cmd = input("sat> ").strip()
+            cmd = read_line("sat> ").strip()
         except (EOFError, KeyboardInterrupt):
             print("\nExiting.")
             break
@@ -77,86 +192,13 @@ def main() -> None:
             print("Bye.")
             break
 
-        elif op == "help":
-            print(
-                "\nCommands:\n"
-                "  state                         Show current satellite state\n"
-                "  kp <value>                    Publish SPACE_WEATHER (kp index)\n"
-                "  pass <minutes>                Publish NEXT_PASS (minutes to next pass)\n"
-                "  anomaly <signature>           Publish ANOMALY event\n"
-                "  connect_file <path.json>      Load a descriptor from file and try to join\n"
-                "  connect_json                  Paste JSON descriptor (ends with a blank line)\n"
-                "  disconnect <module_id>        Remove a joined module\n"
-                "  list_modules                  List descriptor files in ./modules\n"
-                "  save_json                     Paste JSON descriptor and save to ./modules then join\n"
-                "  quit / exit                   Stop the app\n"
-            )
-
-        elif op == "state":
-            print(pretty_state(state))
-            print("Quarantine IDs:", ", ".join(sorted(reg.quarantine.keys())) if reg.quarantine else "(none)")
-
-        elif op == "kp" and len(parts) >= 2:
-            bus.publish("SPACE_WEATHER", {"kp": float(parts[1])})
-
-        elif op == "pass" and len(parts) >= 2:
-            bus.publish("NEXT_PASS", {"minutes": int(parts[1])})
-
-        elif op == "anomaly" and len(parts) >= 2:
-            signature = " ".join(parts[1:])
-            bus.publish("ANOMALY", {"signature": signature})
-
-        elif op == "list_modules":
-            files = store.list_files()
-            if not files:
-                print("(no module JSON files found)")
-            else:
-                for p in files:
-                    print("-", p.name)
-
-        elif op == "connect_file" and len(parts) >= 2:
-            p = Path(parts[1]).expanduser()
-            if not p.exists():
-                print("File not found.")
-                continue
-            try:
-                desc = json.loads(p.read_text(encoding="utf-8"))
-            except Exception as e:
-                print("Invalid JSON:", e)
-                continue
-            connect_module(bus, reg, desc)
-
-        elif op == "disconnect" and len(parts) >= 2:
-            module_id = parts[1]
-            if reg.remove_module(module_id):
-                bus.publish("MODULE_REMOVED", {"module_id": module_id})
-                # recomposition after removal (force re-evaluate)
-                orch._recompose(reason=f"module removed: {module_id}")
-            else:
-                print("Module not joined:", module_id)
-
-        elif op in ("connect_json", "save_json"):
-            print("Paste JSON (end with an empty line):")
-            lines = []
-            while True:
-                line = input()
-                if line.strip() == "":
-                    break
-                lines.append(line)
-            raw = "\n".join(lines)
-            try:
-                desc = json.loads(raw)
-            except Exception as e:
-                print("Invalid JSON:", e)
-                continue
-
-            if op == "save_json":
-                path = store.save_descriptor(desc)
-                print(f"Saved to {path}")
-            connect_module(bus, reg, desc)
-
-        else:
+        entry = commands.get(op)
+        if entry is None or len(parts) < entry[1]:
             print("Unknown command. Type 'help'.")
+            continue
+
+        handler, _ = entry
+        handler(parts)
 
 if __name__ == "__main__":
     main()